@@ -15,6 +15,7 @@ class Settings(BaseSettings):
     APP_DESCRIPTION: str = Field(default="A production-ready FastAPI + MongoDB template")
     ENVIRONMENT: str = Field(default="development")
     DEBUG: bool = Field(default=True)
+    TESTING: bool = Field(default=False)  # Disables OpenAPI/docs routes under pytest
 
     # Server
     HOST: str = Field(default="0.0.0.0")
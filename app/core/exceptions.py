@@ -27,10 +27,11 @@ class NotFoundException(BaseAPIException):
 
 
 class BadRequestException(BaseAPIException):
-    """Exception raised for bad requests"""
+    """Exception raised for bad requests, optionally tagged with a machine-readable code"""
 
-    def __init__(self, detail: str = "Bad request"):
+    def __init__(self, detail: str = "Bad request", code: str = None):
         super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+        self.code = code
 
 
 class UnauthorizedException(BaseAPIException):
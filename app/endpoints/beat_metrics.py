@@ -33,7 +33,6 @@ async def get_beat_metrics(
     service: BeatMetricsService = Depends(get_beat_metrics_service),
 ):
     """Get all beat metrics with optional filtering and pagination"""
-    await service.ensure_indexes()
     return await service.get_all(beat_id=beat_id, skip=skip, limit=limit)
 
 
@@ -49,7 +48,6 @@ async def get_beat_metrics_by_id(
     service: BeatMetricsService = Depends(get_beat_metrics_service)
 ):
     """Get a specific beat metrics by ID"""
-    await service.ensure_indexes()
     return await service.get_by_id(beat_metrics_id)
 
 
@@ -81,8 +79,6 @@ async def create_beat_metrics(
 
     La validación de permisos se hace automáticamente consultando el microservicio de beats.
     """
-    await service.ensure_indexes()
-
     beat_metrics_data = BeatMetricsCreate(
         beatId=beatId,
         audioUrl=audioUrl
@@ -114,7 +110,6 @@ async def update_beat_metrics(
 
     La validación de permisos se hace automáticamente consultando el microservicio de beats.
     """
-    await service.ensure_indexes()
     user_roles = user.get("roles", [])
     is_admin = "admin" in user_roles
     return await service.update(beat_metrics_id, beat_metrics, user_id=user["userId"], is_admin=is_admin)
@@ -139,7 +134,6 @@ async def delete_beat_metrics(
 
     La validación de permisos se hace automáticamente consultando el microservicio de beats.
     """
-    await service.ensure_indexes()
     user_roles = user.get("roles", [])
     is_admin = "admin" in user_roles
     return await service.delete(beat_metrics_id, user_id=user["userId"], is_admin=is_admin)
@@ -29,7 +29,6 @@ async def list_dashboards(
 
     El filtrado se hace automáticamente según el rol del usuario autenticado.
     """
-    await service.ensure_indexes()
     await service.seed_initial()
 
     # Si el usuario es admin, mostrar todos los dashboards
@@ -47,7 +46,6 @@ async def get_dashboard(
     user: dict = Depends(get_current_user),
     service: DashboardService = Depends(get_dashboard_service)
 ):
-    await service.ensure_indexes()
     return await service.get_by_id(dashboard_id)
 
 
@@ -65,7 +63,6 @@ async def create_dashboard(
 
     Se verifica que el usuario tenga acceso al beat especificado.
     """
-    await service.ensure_indexes()
     user_roles = user.get("roles", [])
     is_admin = "admin" in user_roles
     # Pasar el userId del usuario autenticado y is_admin al servicio
@@ -87,7 +84,6 @@ async def update_dashboard(
 
     La validación de permisos se hace automáticamente.
     """
-    await service.ensure_indexes()
     user_roles = user.get("roles", [])
     is_admin = "admin" in user_roles
     return await service.update(dashboard_id, dashboard, user_id=user["userId"], is_admin=is_admin)
@@ -107,7 +103,6 @@ async def delete_dashboard(
 
     La validación de permisos se hace automáticamente.
     """
-    await service.ensure_indexes()
     user_roles = user.get("roles", [])
     is_admin = "admin" in user_roles
     return await service.delete(dashboard_id, user_id=user["userId"], is_admin=is_admin)
\ No newline at end of file
@@ -32,7 +32,6 @@ async def get_widgets(
     service: WidgetService = Depends(get_widget_service)
 ):
     """Get all widgets with optional filtering and pagination"""
-    await service.ensure_indexes()
     return await service.get_all(dashboard_id=dashboard_id, skip=skip, limit=limit)
 
 
@@ -48,7 +47,6 @@ async def get_widget(
     service: WidgetService = Depends(get_widget_service)
 ):
     """Get a specific widget by ID"""
-    await service.ensure_indexes()
     return await service.get_by_id(widget_id)
 
 
@@ -72,7 +70,6 @@ async def create_widget(
 
     La validación de permisos se hace automáticamente.
     """
-    await service.ensure_indexes()
     user_roles = user.get("roles", [])
     is_admin = "admin" in user_roles
     return await service.create(widget, user_id=user["userId"], is_admin=is_admin)
@@ -98,7 +95,6 @@ async def update_widget(
 
     La validación de permisos se hace automáticamente.
     """
-    await service.ensure_indexes()
     user_roles = user.get("roles", [])
     is_admin = "admin" in user_roles
     return await service.update(widget_id, widget, user_id=user["userId"], is_admin=is_admin)
@@ -123,7 +119,6 @@ async def delete_widget(
 
     La validación de permisos se hace automáticamente.
     """
-    await service.ensure_indexes()
     user_roles = user.get("roles", [])
     is_admin = "admin" in user_roles
     return await service.delete(widget_id, user_id=user["userId"], is_admin=is_admin)
@@ -148,7 +143,6 @@ async def get_dashboard_widgets(
 
     La validación de permisos se hace automáticamente.
     """
-    await service.ensure_indexes()
     user_roles = user.get("roles", [])
     is_admin = "admin" in user_roles
     return await service.get_by_dashboard(dashboard_id, user_id=user["userId"], is_admin=is_admin)
\ No newline at end of file
@@ -6,6 +6,7 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from app.core.exceptions import NotFoundException, BadRequestException, DatabaseException
 from app.schemas.dashboard import DashboardCreate, DashboardUpdate
+from app.services.widget_service import WidgetService
 from app.utils.beat_ownership import verify_beat_ownership
 
 
@@ -207,6 +208,7 @@ class DashboardService:
 
         try:
             await self.collection.delete_one({"_id": oid})
+            WidgetService.invalidate_dashboard_access(str(oid))
             return {"message": "Dashboard deleted successfully", "id": dashboard_id}
         except Exception as e:
             raise DatabaseException(f"Failed to delete dashboard: {str(e)}")
@@ -1,6 +1,8 @@
 """
 Widget service - Business logic for Widget operations
 """
+import time
+from functools import lru_cache
 from typing import List, Optional
 from datetime import datetime
 from bson import ObjectId
@@ -11,10 +13,24 @@ from app.core.exceptions import NotFoundException, BadRequestException, Database
 from app.schemas.widget import WidgetCreate, WidgetUpdate
 
 
+@lru_cache(maxsize=4096)
+def _oid(value: str) -> ObjectId:
+    """Parse an ObjectId, reusing the result for ids seen recently (raises InvalidId)"""
+    return ObjectId(value)
+
+
 class WidgetService:
     """Service class for Widget-related business logic"""
     
     MAX_GRID_WIDTH = 5  # Maximum grid width (5 columns)
+    # Seconds a granted dashboard access is reused. The cache is per process: deleting a
+    # dashboard only clears this worker's entries, so other workers may keep granting
+    # access to it until their entries expire
+    ACCESS_CACHE_TTL = 5.0
+    ACCESS_CACHE_MAX_ENTRIES = 1024
+
+    # Shared by every instance: the service is created per request
+    _access_cache: dict = {}
 
     def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
@@ -70,7 +86,7 @@ class WidgetService:
             BadRequestException: If ID is invalid
         """
         try:
-            return ObjectId(widget_id)
+            return _oid(widget_id)
         except InvalidId:
             raise BadRequestException(f"Invalid widget ID format: {widget_id}")
 
@@ -157,7 +173,7 @@ class WidgetService:
             BadRequestException: If user doesn't have access to the dashboard
         """
         try:
-            dashboard_oid = ObjectId(dashboard_id)
+            dashboard_oid = _oid(dashboard_id)
         except InvalidId:
             raise BadRequestException(f"Invalid dashboard ID format: {dashboard_id}")
 
@@ -167,10 +183,56 @@ class WidgetService:
 
         # Verificar que el usuario es el dueño o es admin
         if not is_admin and dashboard.get("owner_id") != user_id:
-            raise BadRequestException("You don't have access to this dashboard")
+            raise BadRequestException("You don't have access to this dashboard", code="DASHBOARD_ACCESS_DENIED")
 
         return dashboard
 
+    async def _check_dashboard_access(self, dashboard_id: str, user_id: str, is_admin: bool = False):
+        """
+        Verify dashboard access, reusing a granted decision for ACCESS_CACHE_TTL seconds
+
+        Only the expiry of a granted decision is cached, keyed on the normalized
+        dashboard id, so a denied or missing dashboard is looked up every time.
+
+        Raises:
+            NotFoundException: If dashboard not found
+            BadRequestException: If the ID is invalid or the user doesn't have access
+        """
+        try:
+            key = (str(_oid(dashboard_id)), user_id, is_admin)
+        except InvalidId:
+            raise BadRequestException(f"Invalid dashboard ID format: {dashboard_id}")
+
+        expires = self._access_cache.get(key)
+        if expires and expires > time.monotonic():
+            return
+
+        await self.verify_dashboard_ownership(dashboard_id, user_id, is_admin)
+
+        if len(self._access_cache) >= self.ACCESS_CACHE_MAX_ENTRIES:
+            self._access_cache.clear()
+        self._access_cache[key] = time.monotonic() + self.ACCESS_CACHE_TTL
+
+    @classmethod
+    def invalidate_dashboard_access(cls, dashboard_id: str):
+        """
+        Forget every cached access decision for a dashboard
+
+        Args:
+            dashboard_id: Dashboard ID whose cached access is dropped, in any hex case
+        """
+        try:
+            normalized_id = str(_oid(dashboard_id))
+        except InvalidId:
+            return
+        for key in [key for key in cls._access_cache if key[0] == normalized_id]:
+            cls._access_cache.pop(key, None)
+
+    @classmethod
+    def clear_access_cache(cls):
+        """Forget every cached dashboard access decision"""
+        cls._access_cache.clear()
+
     async def create(self, widget_data: WidgetCreate, user_id: str, is_admin: bool = False) -> dict:
         """
         Create a new widget
@@ -189,7 +251,7 @@ class WidgetService:
         widget_dict = widget_data.model_dump(by_alias=False)
 
         # Verificar que el usuario tiene acceso al dashboard
-        await self.verify_dashboard_ownership(
+        await self._check_dashboard_access(
             widget_dict["dashboard_id"],
             user_id,
             is_admin
@@ -231,7 +293,7 @@ class WidgetService:
             raise NotFoundException(resource="Widget", resource_id=widget_id)
 
         # Verificar que el usuario tiene acceso al dashboard del widget
-        await self.verify_dashboard_ownership(
+        await self._check_dashboard_access(
             existing_widget["dashboard_id"],
             user_id,
             is_admin
@@ -279,7 +341,7 @@ class WidgetService:
             raise NotFoundException(resource="Widget", resource_id=widget_id)
 
         # Verificar que el usuario tiene acceso al dashboard del widget
-        await self.verify_dashboard_ownership(
+        await self._check_dashboard_access(
             existing_widget["dashboard_id"],
             user_id,
             is_admin
@@ -325,6 +387,6 @@ class WidgetService:
             BadRequestException: If user doesn't own the dashboard
         """
         # Verificar que el usuario tiene acceso al dashboard
-        await self.verify_dashboard_ownership(dashboard_id, user_id, is_admin)
+        await self._check_dashboard_access(dashboard_id, user_id, is_admin)
 
         return await self.get_all(dashboard_id=dashboard_id, skip=0, limit=1000)
\ No newline at end of file
@@ -2,9 +2,11 @@
 FastAPI MongoDB Template - Main Application
 """
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
@@ -15,6 +17,7 @@ from app.endpoints import dashboards
 from app.endpoints import widgets
 from app.endpoints import beat_metrics
 from app.endpoints.examples import example_rate_limit
+from app.services import BeatMetricsService, DashboardService, WidgetService
 from app.middleware.authentication import verify_jwt_token
 from app.middleware.rate_limiter import limiter, init_redis, close_redis, rate_limit_handler
 from slowapi.errors import RateLimitExceeded
@@ -27,6 +30,13 @@ async def lifespan(app: FastAPI):
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     try:
         await database.connect()
+        db = await database.get_database()
+        # Indexes are created once here instead of on every request
+        await asyncio.gather(
+            DashboardService(db).ensure_indexes(),
+            WidgetService(db).ensure_indexes(),
+            BeatMetricsService(db).ensure_indexes(),
+        )
         await init_redis()  # Initialize Redis for rate limiting
         logger.info("Application startup complete")
     except Exception as e:
@@ -43,10 +53,12 @@ app = FastAPI(
     title=settings.APP_NAME,
     description=settings.APP_DESCRIPTION,
     version=settings.APP_VERSION,
-    docs_url="/docs",
-    redoc_url="/redoc",
+    docs_url=None if settings.TESTING else "/docs",
+    redoc_url=None if settings.TESTING else "/redoc",
+    openapi_url=None if settings.TESTING else "/openapi.json",
     lifespan=lifespan,
     debug=settings.DEBUG,
+    default_response_class=ORJSONResponse,
 )
 
 # Add rate limiter state to app
@@ -78,7 +90,7 @@ async def root():
     return {
         "message": f"Welcome to {settings.APP_NAME}",
         "version": settings.APP_VERSION,
-        "docs": "/docs",
+        "docs": app.docs_url,
         "health": "/api/v1/analytics/health",
     }
 
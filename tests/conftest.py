@@ -1,15 +1,52 @@
 """
 Pytest configuration and fixtures
 """
+import asyncio
+import os
+
+# Must be set before app.core.config builds the settings singleton (imported via main)
+os.environ.setdefault("TESTING", "true")
+
+import orjson
 import pytest
 import pytest_asyncio
-from typing import AsyncGenerator
-from httpx import AsyncClient
+from datetime import datetime
+from typing import AsyncGenerator, Generator
+from fastapi import HTTPException, Request, status
+from httpx import ASGITransport, AsyncClient
 from motor.motor_asyncio import AsyncIOMotorClient
 
 from main import app
 from app.core.config import settings
-from app.database import database
+from app.database import database, get_db
+from app.middleware.authentication import get_current_user
+from app.services import DashboardService, WidgetService
+
+try:
+    import uvloop
+except ImportError:  # uvicorn[standard] only installs it outside Windows
+    uvloop = None
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--backend",
+        choices=("real", "mock"),
+        # In-process mongomock unless USE_REAL_MONGO asks for the server at MONGODB_URL
+        default="real" if os.getenv("USE_REAL_MONGO") else "mock",
+        help="MongoDB backend for the tests: a real server or in-process mongomock-motor",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip the tests that need a real MongoDB server when running on mongomock"""
+    if config.getoption("--backend") != "mock":
+        return
+
+    skip_real = pytest.mark.skip(reason="needs a real MongoDB server (--backend=real)")
+    for item in items:
+        if "requires_real_mongo" in item.keywords:
+            item.add_marker(skip_real)
 
 
 @pytest.fixture(scope="session")
@@ -18,32 +55,158 @@ def anyio_backend():
     return "asyncio"
 
 
-@pytest_asyncio.fixture
-async def test_db():
-    """Create a test database instance"""
-    test_db_name = f"{settings.MONGODB_DB_NAME}_test"
-    test_client = AsyncIOMotorClient(settings.MONGODB_URL)
-    test_database = test_client[test_db_name]
+@pytest.fixture(scope="session")
+def event_loop():
+    """Share one event loop across the session so async fixtures can be session-scoped"""
+    loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+    yield loop
+    loop.close()
 
-    yield test_database
 
-    # Cleanup: drop test database
-    await test_client.drop_database(test_db_name)
+@pytest.fixture(scope="session")
+def mongo_client(pytestconfig):
+    """Create a single MongoDB client shared by the whole test session"""
+    if pytestconfig.getoption("--backend") == "mock":
+        from mongomock_motor import AsyncMongoMockClient
+
+        test_client = AsyncMongoMockClient()
+    else:
+        test_client = AsyncIOMotorClient(settings.MONGODB_URL)
+    yield test_client
     test_client.close()
 
 
+async def _truncate_collections(db) -> None:
+    """Remove every document from the non-system collections of a database concurrently"""
+    # delete_many keeps the indexes created once per session; drop() would discard them
+    names = await db.list_collection_names()
+    await asyncio.gather(*(db[name].delete_many({}) for name in names if not name.startswith("system.")))
+
+
+@pytest_asyncio.fixture(scope="session")
+async def indexed_test_db(mongo_client):
+    """Test database for this worker, with the app's indexes created once per session"""
+    # One database per xdist worker so parallel runs don't share state
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+    test_database = mongo_client[f"{settings.MONGODB_DB_NAME}_test_{worker}"]
+
+    # The app creates these at startup, which the test client never runs
+    await asyncio.gather(
+        DashboardService(test_database).ensure_indexes(),
+        WidgetService(test_database).ensure_indexes(),
+    )
+    return test_database
+
+
 @pytest_asyncio.fixture
+async def test_db(indexed_test_db):
+    """Provide an empty test database, truncated before and after each test"""
+    await _truncate_collections(indexed_test_db)
+    WidgetService.clear_access_cache()
+    yield indexed_test_db
+    await _truncate_collections(indexed_test_db)
+
+
+@pytest_asyncio.fixture(scope="session")
 async def client() -> AsyncGenerator[AsyncClient, None]:
-    """Create an async HTTP client for testing"""
-    async with AsyncClient(app=app, base_url="http://test") as ac:
+    """Create one async HTTP client shared by the whole test session"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
         yield ac
 
 
+# Setup documents don't depend on the wall clock, so they share one timestamp
+FIXED_NOW = datetime(2024, 1, 1)
+
+# Headers the API Gateway adds to authenticated requests
+USER_HEADERS = {
+    "x-gateway-authenticated": "true",
+    "x-user-id": "user123",
+    "x-user-roles": '["user"]',
+}
+# Admins skip the call to the beats service when creating a dashboard
+ADMIN_HEADERS = {
+    "x-gateway-authenticated": "true",
+    "x-user-id": "admin123",
+    "x-user-roles": '["admin"]',
+}
+DIFFERENT_USER_HEADERS = {
+    "x-gateway-authenticated": "true",
+    "x-user-id": "different_user",
+    "x-user-roles": '["user"]',
+}
+
+
+def _user_from_gateway_headers(request: Request) -> dict:
+    """Build the current user from the gateway headers sent by the tests"""
+    # The gateway middleware lets every path through ("/" is an open path),
+    # so request.state.user is never set and get_current_user would return 401
+    user_id = request.headers.get("x-user-id")
+    if request.headers.get("x-gateway-authenticated") != "true" or not user_id:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+
+    return {
+        "userId": user_id,
+        "roles": orjson.loads(request.headers.get("x-user-roles", "[]")),
+        "pricingPlan": request.headers.get("x-user-pricing-plan"),
+    }
+
+
+@pytest.fixture
+def client_with_test_db(client: AsyncClient, test_db) -> Generator[AsyncClient, None, None]:
+    """Point the shared client's requests at the test database and user for one test"""
+    app.dependency_overrides[get_db] = lambda: test_db
+    app.dependency_overrides[get_current_user] = _user_from_gateway_headers
+    yield client
+    app.dependency_overrides.pop(get_current_user, None)
+    app.dependency_overrides.pop(get_db, None)
+
+
+def _orjson_sender(client: AsyncClient, method: str):
+    """Build a request helper that encodes its JSON body with orjson"""
+    async def _send(url: str, data: dict, headers: dict = None):
+        return await client.request(
+            method,
+            url,
+            content=orjson.dumps(data),
+            headers={**(headers or {}), "content-type": "application/json"},
+        )
+
+    return _send
+
+
+@pytest.fixture
+def post_json(client_with_test_db: AsyncClient):
+    """POST a JSON payload encoded with orjson instead of the stdlib encoder"""
+    return _orjson_sender(client_with_test_db, "POST")
+
+
 @pytest.fixture
-def sample_item_data():
-    """Sample item data for testing"""
+def put_json(client_with_test_db: AsyncClient):
+    """PUT a JSON payload encoded with orjson instead of the stdlib encoder"""
+    return _orjson_sender(client_with_test_db, "PUT")
+
+
+# The sample payloads are shared by the whole session: tests copy them, never mutate them
+@pytest.fixture(scope="session")
+def sample_dashboard_data():
+    """Sample dashboard data for testing"""
+    return {
+        "name": "Test Dashboard",
+        "beatId": "beat123"
+    }
+
+
+@pytest.fixture(scope="session")
+def sample_widget_data():
+    """Sample widget data for testing (dashboardId is added per test)"""
+    return {
+        "metricType": "BPM"
+    }
+
+
+@pytest.fixture(scope="session")
+def sample_widget_update_data():
+    """Sample widget update data for testing"""
     return {
-        "title": "Test Item",
-        "description": "This is a test item",
-        "completed": False
+        "metricType": "ENERGY"
     }
@@ -0,0 +1,124 @@
+"""
+Tests for Dashboard endpoints
+"""
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from tests.conftest import ADMIN_HEADERS, FIXED_NOW, USER_HEADERS
+
+_MISSING = "507f1f77bcf86cd799439011"
+_MISSING_URL = f"/api/v1/analytics/dashboards/{_MISSING}"
+_MISSING_DETAIL = f"Dashboard with id '{_MISSING}' not found"
+
+
+@pytest_asyncio.fixture
+async def created_dashboard(test_db, sample_dashboard_data):
+    """Insert a dashboard owned by user123 and return its id"""
+    result = await test_db.dashboards.insert_one({
+        "owner_id": "user123",
+        "beat_id": sample_dashboard_data["beatId"],
+        "name": sample_dashboard_data["name"],
+        "created_at": FIXED_NOW,
+        "updated_at": None
+    })
+    return str(result.inserted_id)
+
+
+async def test_create_dashboard(post_json, sample_dashboard_data):
+    """Test creating a new dashboard"""
+    response = await post_json(
+        "/api/v1/analytics/dashboards",
+        sample_dashboard_data,
+        headers=ADMIN_HEADERS
+    )
+    assert response.status_code == 201
+    data = response.json()
+    assert data["name"] == sample_dashboard_data["name"]
+    assert data["beatId"] == sample_dashboard_data["beatId"]
+    assert data["ownerId"] == "admin123"
+    assert "id" in data
+    assert "createdAt" in data
+
+
+async def test_get_dashboards(client_with_test_db: AsyncClient, created_dashboard):
+    """Test retrieving the user's dashboards"""
+    response = await client_with_test_db.get("/api/v1/analytics/dashboards", headers=USER_HEADERS)
+    assert response.status_code == 200
+    data = response.json()
+    assert isinstance(data, list)
+    assert [d["id"] for d in data] == [created_dashboard]
+
+
+async def test_get_dashboard_not_found(client_with_test_db: AsyncClient):
+    """Test retrieving a non-existent dashboard"""
+    response = await client_with_test_db.get(_MISSING_URL, headers=USER_HEADERS)
+    assert response.status_code == 404
+    # The service's NotFoundException, not Starlette's default 404 for an unknown route
+    assert response.json()["detail"] == _MISSING_DETAIL
+
+
+@pytest.mark.parametrize(
+    "send,expected,updated,follow_up_status",
+    [
+        # send issues the request; PUT bodies go through the orjson put_json sender.
+        # expected maps the sample dashboard data to the fields the response must carry
+        pytest.param(
+            lambda client, put_json, url: client.get(url, headers=USER_HEADERS),
+            lambda sample: {"name": sample["name"], "beatId": sample["beatId"]}, False, 200,
+            id="get",
+        ),
+        pytest.param(
+            lambda client, put_json, url: put_json(url, {"name": "Updated Name"}, USER_HEADERS),
+            lambda sample: {"name": "Updated Name", "beatId": sample["beatId"]}, True, 200,
+            id="update",
+        ),
+        pytest.param(
+            lambda client, put_json, url: client.delete(url, headers=USER_HEADERS),
+            lambda sample: {"message": "Dashboard deleted successfully"}, False, 404,
+            id="delete",
+        ),
+    ],
+)
+async def test_existing_dashboard(
+    client_with_test_db: AsyncClient,
+    created_dashboard,
+    sample_dashboard_data,
+    put_json,
+    send,
+    expected,
+    updated,
+    follow_up_status
+):
+    """Test reading, updating and deleting an existing dashboard"""
+    url = f"/api/v1/analytics/dashboards/{created_dashboard}"
+
+    response = await send(client_with_test_db, put_json, url)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["id"] == created_dashboard
+    for field, value in expected(sample_dashboard_data).items():
+        assert data[field] == value
+    assert (data.get("updatedAt") is not None) is updated
+
+    # A deleted dashboard is gone; the others can still be read
+    follow_up = await client_with_test_db.get(url, headers=USER_HEADERS)
+    assert follow_up.status_code == follow_up_status
+
+
+async def test_delete_dashboard_not_found(client_with_test_db: AsyncClient):
+    """Test deleting a non-existent dashboard"""
+    response = await client_with_test_db.delete(_MISSING_URL, headers=USER_HEADERS)
+    assert response.status_code == 404
+    assert response.json()["detail"] == _MISSING_DETAIL
+
+
+async def test_create_dashboard_validation(post_json):
+    """Test dashboard creation with invalid data"""
+    invalid_data = {"beatId": "beat123"}  # Missing name
+    response = await post_json(
+        "/api/v1/analytics/dashboards",
+        invalid_data,
+        headers=ADMIN_HEADERS
+    )
+    assert response.status_code == 422
@@ -0,0 +1,59 @@
+"""
+Tests for DashboardService
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.exceptions import DatabaseException
+from app.services.dashboard_service import DashboardService
+
+_INSERT_FAIL = RuntimeError("Insert failed")
+
+
+@pytest.fixture
+def mock_db():
+    """Mock MongoDB database with a dashboards collection"""
+    db = MagicMock()
+    db.dashboards = MagicMock()
+    return db
+
+
+@pytest.fixture
+def dashboard_service(mock_db):
+    """DashboardService bound to the mock database"""
+    return DashboardService(mock_db)
+
+
+async def test_seed_initial_empty_collection(dashboard_service, mock_db):
+    """Test seeding default dashboards when the collection is empty"""
+    mock_db.dashboards.count_documents = AsyncMock(return_value=0)
+    mock_db.dashboards.insert_many = AsyncMock()
+
+    await dashboard_service.seed_initial()
+
+    mock_db.dashboards.insert_many.assert_called_once()
+    seeded = mock_db.dashboards.insert_many.call_args[0][0]
+    assert [d["name"] for d in seeded] == ["General", "Ventas"]
+    assert all(d["owner_id"] == "system" for d in seeded)
+
+
+async def test_seed_initial_existing_dashboards(dashboard_service, mock_db):
+    """Test seeding is skipped when dashboards already exist"""
+    mock_db.dashboards.count_documents = AsyncMock(return_value=3)
+    mock_db.dashboards.insert_many = AsyncMock()
+
+    await dashboard_service.seed_initial()
+
+    mock_db.dashboards.insert_many.assert_not_called()
+
+
+async def test_seed_initial_database_error(dashboard_service, mock_db):
+    """Test seeding wraps insert failures in DatabaseException"""
+    mock_db.dashboards.count_documents = AsyncMock(return_value=0)
+    mock_db.dashboards.insert_many = AsyncMock(side_effect=_INSERT_FAIL)
+
+    with pytest.raises(DatabaseException) as exc_info:
+        await dashboard_service.seed_initial()
+
+    assert "Failed to seed dashboards" in exc_info.value.detail
+    assert "Insert failed" in exc_info.value.detail
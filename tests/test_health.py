@@ -6,13 +6,14 @@ from httpx import AsyncClient
 
 
 @pytest.mark.asyncio
-async def test_health_check(client: AsyncClient):
+async def test_health_check(client_with_test_db: AsyncClient):
     """Test health check endpoint"""
-    response = await client.get("/api/v1/analytics/health")
+    response = await client_with_test_db.get("/api/v1/analytics/health")
     assert response.status_code == 200
     data = response.json()
     assert "status" in data
     assert "database" in data
+    assert data["database"] == "connected"
 
 
 @pytest.mark.asyncio
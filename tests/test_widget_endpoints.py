@@ -0,0 +1,497 @@
+"""
+Tests for Widget endpoints
+"""
+import asyncio
+
+import pytest
+import pytest_asyncio
+from bson import ObjectId
+from httpx import AsyncClient
+
+from tests.conftest import ADMIN_HEADERS, DIFFERENT_USER_HEADERS, FIXED_NOW, USER_HEADERS
+
+_DASHBOARD_WIDGETS_URL = "/api/v1/analytics/dashboards/%s/widgets"
+
+
+@pytest_asyncio.fixture
+async def db_with_dashboard_and_widget(test_db):
+    """
+    Test database with one dashboard owned by user123 and one widget on it
+
+    Returns the documents plus their ids already converted to str.
+    """
+    dashboard_doc = {
+        "_id": ObjectId(),
+        "owner_id": "user123",
+        "beat_id": "beat123",
+        "name": "Test Dashboard",
+        "created_at": FIXED_NOW,
+        "updated_at": None
+    }
+    dashboard_id = str(dashboard_doc["_id"])
+    widget_doc = {
+        "_id": ObjectId(),
+        "dashboard_id": dashboard_id,
+        "metric_type": "BPM",
+        "created_at": FIXED_NOW,
+        "updated_at": None
+    }
+    # Different collections, so the two inserts can be in flight together
+    await asyncio.gather(
+        test_db.dashboards.insert_one(dashboard_doc),
+        test_db.widgets.insert_one(widget_doc)
+    )
+
+    return test_db, dashboard_doc, widget_doc, str(widget_doc["_id"]), dashboard_id
+
+
+@pytest_asyncio.fixture
+async def db_with_multiple_widgets(test_db):
+    """
+    Test database with two dashboards owned by user123 holding three widgets
+
+    Returns the documents plus the two dashboard ids already converted to str.
+    """
+    dashboard1_oid, dashboard2_oid, *widget_oids = [ObjectId() for _ in range(5)]
+    dashboard1_id = str(dashboard1_oid)
+    dashboard2_id = str(dashboard2_oid)
+    dashboard1 = {
+        "_id": dashboard1_oid,
+        "owner_id": "user123",
+        "beat_id": "beat123",
+        "name": "Dashboard 1",
+        "created_at": FIXED_NOW,
+        "updated_at": None
+    }
+    dashboard2 = {
+        "_id": dashboard2_oid,
+        "owner_id": "user123",
+        "beat_id": "beat456",
+        "name": "Dashboard 2",
+        "created_at": FIXED_NOW,
+        "updated_at": None
+    }
+    widgets = [
+        {
+            "_id": widget_oid,
+            "dashboard_id": dashboard_id,
+            "metric_type": metric_type,
+            "created_at": FIXED_NOW,
+            "updated_at": None
+        }
+        for widget_oid, (dashboard_id, metric_type) in zip(
+            widget_oids,
+            [(dashboard1_id, "BPM"), (dashboard1_id, "ENERGY"), (dashboard2_id, "KEY")]
+        )
+    ]
+    # The _ids are set up front, so the documents need no particular insert order
+    await asyncio.gather(
+        test_db.dashboards.insert_many([dashboard1, dashboard2], ordered=False),
+        test_db.widgets.insert_many(widgets, ordered=False)
+    )
+
+    return test_db, dashboard1, dashboard2, widgets, dashboard1_id, dashboard2_id
+
+
+# GET /analytics/widgets
+
+async def test_list_widgets_success(client_with_test_db: AsyncClient, db_with_multiple_widgets):
+    """Test listing all widgets"""
+    response = await client_with_test_db.get(
+        "/api/v1/analytics/widgets",
+        headers=USER_HEADERS
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert isinstance(data, list)
+    assert len(data) == 3
+
+
+async def test_list_widgets_filter_by_dashboard(client_with_test_db: AsyncClient, db_with_multiple_widgets):
+    """Test listing widgets filtered by dashboard"""
+    *_, dashboard1_id, _ = db_with_multiple_widgets
+
+    response = await client_with_test_db.get(
+        "/api/v1/analytics/widgets",
+        params={"dashboardId": dashboard1_id},
+        headers=USER_HEADERS
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 2
+    assert {w["metricType"] for w in data} == {"BPM", "ENERGY"}
+
+
+async def test_list_widgets_pagination(client_with_test_db: AsyncClient, db_with_multiple_widgets):
+    """Test listing widgets with skip and limit"""
+    response = await client_with_test_db.get(
+        "/api/v1/analytics/widgets",
+        params={"skip": 1, "limit": 1},
+        headers=USER_HEADERS
+    )
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+
+
+async def test_list_widgets_empty(client_with_test_db: AsyncClient, test_db):
+    """Test listing widgets when there are none"""
+    response = await client_with_test_db.get(
+        "/api/v1/analytics/widgets",
+        headers=USER_HEADERS
+    )
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+# GET /analytics/widgets/{widget_id}
+
+@pytest.mark.parametrize(
+    "id_factory,expected_status,expected",
+    [
+        # expected maps the requested id to the fields the response must carry
+        pytest.param(
+            lambda widget_id: widget_id, 200,
+            lambda widget_id: {"id": widget_id, "metricType": "BPM"},
+            id="success",
+        ),
+        pytest.param(
+            lambda widget_id: str(ObjectId()), 404,
+            lambda widget_id: {"detail": f"Widget with id '{widget_id}' not found"},
+            id="not_found",
+        ),
+        pytest.param(
+            lambda widget_id: "invalid_id", 400,
+            lambda widget_id: {"detail": f"Invalid widget ID format: {widget_id}"},
+            id="invalid_id",
+        ),
+    ],
+)
+async def test_get_widget(
+    client_with_test_db: AsyncClient, db_with_dashboard_and_widget, id_factory, expected_status, expected
+):
+    """Test retrieving an existing, a missing and a malformed widget ID"""
+    *_, fixture_widget_id, _ = db_with_dashboard_and_widget
+    widget_id = id_factory(fixture_widget_id)
+
+    response = await client_with_test_db.get(
+        f"/api/v1/analytics/widgets/{widget_id}",
+        headers=USER_HEADERS
+    )
+    assert response.status_code == expected_status
+    data = response.json()
+    for field, value in expected(widget_id).items():
+        assert data[field] == value
+
+
+# POST /analytics/widgets
+
+async def test_create_widget_success(
+    post_json, db_with_dashboard_and_widget, sample_widget_data
+):
+    """Test creating a widget on an owned dashboard"""
+    test_db, *_, dashboard_id = db_with_dashboard_and_widget
+    payload = {**sample_widget_data, "dashboardId": dashboard_id}
+
+    response = await post_json(
+        "/api/v1/analytics/widgets",
+        payload,
+        headers=USER_HEADERS
+    )
+    assert response.status_code == 201
+    data = response.json()
+    assert data["metricType"] == "BPM"
+    assert "id" in data
+    assert await test_db.widgets.count_documents({"dashboard_id": dashboard_id}) == 2
+
+
+async def test_create_widget_admin(post_json, test_db, sample_widget_data):
+    """Test an admin can create widgets on any dashboard"""
+    dashboard_doc = {
+        "_id": ObjectId(),
+        "owner_id": "other_user",
+        "beat_id": "beat789",
+        "name": "Other Dashboard",
+        "created_at": FIXED_NOW,
+        "updated_at": None
+    }
+    await test_db.dashboards.insert_one(dashboard_doc)
+    payload = {**sample_widget_data, "dashboardId": str(dashboard_doc["_id"])}
+
+    response = await post_json(
+        "/api/v1/analytics/widgets",
+        payload,
+        headers=ADMIN_HEADERS
+    )
+    assert response.status_code == 201
+    assert response.json()["metricType"] == "BPM"
+
+
+async def test_create_widget_user_doesnt_own_dashboard(
+    post_json, db_with_dashboard_and_widget, sample_widget_data
+):
+    """Test a user cannot create widgets on another user's dashboard"""
+    *_, dashboard_id = db_with_dashboard_and_widget
+    payload = {**sample_widget_data, "dashboardId": dashboard_id}
+
+    response = await post_json(
+        "/api/v1/analytics/widgets",
+        payload,
+        headers=DIFFERENT_USER_HEADERS
+    )
+    assert response.status_code == 400
+    assert "don't have access" in response.json()["detail"]
+
+
+async def test_create_widget_dashboard_not_found(
+    post_json, test_db, sample_widget_data
+):
+    """Test creating a widget on a non-existent dashboard"""
+    payload = {**sample_widget_data, "dashboardId": str(ObjectId())}
+
+    response = await post_json(
+        "/api/v1/analytics/widgets",
+        payload,
+        headers=USER_HEADERS
+    )
+    assert response.status_code == 404
+    assert "Dashboard" in response.json()["detail"]
+
+
+async def test_create_widget_validation_error(post_json, test_db):
+    """Test widget creation with missing required fields"""
+    response = await post_json(
+        "/api/v1/analytics/widgets",
+        {"dashboardId": str(ObjectId())},
+        headers=USER_HEADERS
+    )
+    assert response.status_code == 422
+
+
+# PUT /analytics/widgets/{widget_id}
+
+async def test_update_widget_success(
+    put_json, db_with_dashboard_and_widget, sample_widget_update_data
+):
+    """Test updating a widget on an owned dashboard"""
+    *_, widget_id, _ = db_with_dashboard_and_widget
+
+    response = await put_json(
+        f"/api/v1/analytics/widgets/{widget_id}",
+        sample_widget_update_data,
+        headers=USER_HEADERS
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["metricType"] == "ENERGY"
+    assert data["updatedAt"] is not None
+
+
+async def test_update_widget_not_found(
+    put_json, test_db, sample_widget_update_data
+):
+    """Test updating a non-existent widget"""
+    response = await put_json(
+        f"/api/v1/analytics/widgets/{str(ObjectId())}",
+        sample_widget_update_data,
+        headers=USER_HEADERS
+    )
+    assert response.status_code == 404
+
+
+async def test_update_widget_user_doesnt_own_dashboard(
+    put_json, test_db, sample_widget_update_data
+):
+    """Test a user cannot update widgets on another user's dashboard"""
+    # Arrange
+    dashboard_doc = {
+        "_id": ObjectId(),
+        "owner_id": "other_user",
+        "beat_id": "beat789",
+        "name": "Other Dashboard",
+        "created_at": FIXED_NOW,
+        "updated_at": None
+    }
+    widget_doc = {
+        "_id": ObjectId(),
+        "dashboard_id": str(dashboard_doc["_id"]),
+        "metric_type": "BPM",
+        "created_at": FIXED_NOW,
+        "updated_at": None
+    }
+    await asyncio.gather(
+        test_db.dashboards.insert_one(dashboard_doc),
+        test_db.widgets.insert_one(widget_doc)
+    )
+
+    # Act
+    response = await put_json(
+        f"/api/v1/analytics/widgets/{str(widget_doc['_id'])}",
+        sample_widget_update_data,
+        headers=USER_HEADERS
+    )
+
+    # Assert
+    assert response.status_code == 400
+    assert "don't have access" in response.json()["detail"]
+
+
+async def test_update_widget_admin_can_update_any(
+    put_json, db_with_dashboard_and_widget, sample_widget_update_data
+):
+    """Test an admin can update widgets on any dashboard"""
+    *_, widget_id, _ = db_with_dashboard_and_widget
+
+    response = await put_json(
+        f"/api/v1/analytics/widgets/{widget_id}",
+        sample_widget_update_data,
+        headers=ADMIN_HEADERS
+    )
+    assert response.status_code == 200
+    assert response.json()["metricType"] == "ENERGY"
+
+
+# DELETE /analytics/widgets/{widget_id}
+
+async def test_delete_widget_success(client_with_test_db: AsyncClient, db_with_dashboard_and_widget):
+    """Test deleting a widget on an owned dashboard"""
+    test_db, _, widget, widget_id, _ = db_with_dashboard_and_widget
+
+    response = await client_with_test_db.delete(
+        f"/api/v1/analytics/widgets/{widget_id}",
+        headers=USER_HEADERS
+    )
+    assert response.status_code == 200
+    assert response.json()["id"] == widget_id
+
+    assert await test_db.widgets.count_documents({"_id": widget["_id"]}, limit=1) == 0
+
+
+async def test_delete_widget_not_found(client_with_test_db: AsyncClient, test_db):
+    """Test deleting a non-existent widget"""
+    response = await client_with_test_db.delete(
+        f"/api/v1/analytics/widgets/{str(ObjectId())}",
+        headers=USER_HEADERS
+    )
+    assert response.status_code == 404
+
+
+async def test_delete_widget_user_doesnt_own_dashboard(client_with_test_db: AsyncClient, test_db):
+    """Test a user cannot delete widgets on another user's dashboard"""
+    # Arrange
+    dashboard_doc = {
+        "_id": ObjectId(),
+        "owner_id": "other_user",
+        "beat_id": "beat789",
+        "name": "Other Dashboard",
+        "created_at": FIXED_NOW,
+        "updated_at": None
+    }
+    widget_doc = {
+        "_id": ObjectId(),
+        "dashboard_id": str(dashboard_doc["_id"]),
+        "metric_type": "BPM",
+        "created_at": FIXED_NOW,
+        "updated_at": None
+    }
+    await asyncio.gather(
+        test_db.dashboards.insert_one(dashboard_doc),
+        test_db.widgets.insert_one(widget_doc)
+    )
+
+    # Act
+    response = await client_with_test_db.delete(
+        f"/api/v1/analytics/widgets/{str(widget_doc['_id'])}",
+        headers=USER_HEADERS
+    )
+
+    # Assert
+    assert response.status_code == 400
+    assert await test_db.widgets.count_documents({"_id": widget_doc["_id"]}, limit=1) == 1
+
+
+async def test_delete_widget_admin_can_delete_any(
+    client_with_test_db: AsyncClient, db_with_dashboard_and_widget
+):
+    """Test an admin can delete widgets on any dashboard"""
+    test_db, _, widget, widget_id, _ = db_with_dashboard_and_widget
+
+    response = await client_with_test_db.delete(
+        f"/api/v1/analytics/widgets/{widget_id}",
+        headers=ADMIN_HEADERS
+    )
+    assert response.status_code == 200
+
+    assert await test_db.widgets.count_documents({"_id": widget["_id"]}, limit=1) == 0
+
+
+# GET /analytics/dashboards/{dashboard_id}/widgets
+
+async def test_get_dashboard_widgets(client_with_test_db: AsyncClient, db_with_multiple_widgets):
+    """Test listing the widgets of an owned, an empty, a missing and another user's dashboard"""
+    test_db, *_, dashboard_id, _ = db_with_multiple_widgets
+    empty_dashboard = {
+        "_id": ObjectId(),
+        "owner_id": "user123",
+        "beat_id": "beat123",
+        "name": "Empty Dashboard",
+        "created_at": FIXED_NOW,
+        "updated_at": None
+    }
+    await test_db.dashboards.insert_one(empty_dashboard)
+
+    # The requests only read, so they can all be in flight together
+    populated, empty, missing, not_owned = await asyncio.gather(
+        client_with_test_db.get(
+            _DASHBOARD_WIDGETS_URL % dashboard_id,
+            headers=USER_HEADERS
+        ),
+        client_with_test_db.get(
+            _DASHBOARD_WIDGETS_URL % empty_dashboard["_id"],
+            headers=USER_HEADERS
+        ),
+        client_with_test_db.get(
+            _DASHBOARD_WIDGETS_URL % ObjectId(),
+            headers=USER_HEADERS
+        ),
+        client_with_test_db.get(
+            _DASHBOARD_WIDGETS_URL % dashboard_id,
+            headers=DIFFERENT_USER_HEADERS
+        )
+    )
+
+    assert populated.status_code == 200
+    assert len(populated.json()) == 2
+
+    assert empty.status_code == 200
+    assert len(empty.json()) == 0
+
+    assert missing.status_code == 404
+    assert "Dashboard" in missing.json()["detail"]
+
+    assert not_owned.status_code == 400
+    assert "don't have access" in not_owned.json()["detail"]
+
+
+# ObjectId hex is case-insensitive, so deleting through either spelling must drop the cached access
+@pytest.mark.parametrize("to_url_id", [str, str.upper], ids=["same_case", "uppercase"])
+async def test_deleted_dashboard_drops_cached_access(
+    client_with_test_db: AsyncClient, post_json, db_with_dashboard_and_widget, sample_widget_data, to_url_id
+):
+    """Test a widget cannot be created on a dashboard deleted right after its widgets were listed"""
+    *_, dashboard_id = db_with_dashboard_and_widget
+
+    listed = await client_with_test_db.get(_DASHBOARD_WIDGETS_URL % dashboard_id, headers=USER_HEADERS)
+    assert listed.status_code == 200
+    deleted = await client_with_test_db.delete(
+        f"/api/v1/analytics/dashboards/{to_url_id(dashboard_id)}",
+        headers=USER_HEADERS
+    )
+    assert deleted.status_code == 200
+
+    response = await post_json(
+        "/api/v1/analytics/widgets",
+        {**sample_widget_data, "dashboardId": dashboard_id},
+        headers=USER_HEADERS
+    )
+    assert response.status_code == 404
+    assert "Dashboard" in response.json()["detail"]
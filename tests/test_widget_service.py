@@ -0,0 +1,473 @@
+"""
+Tests for WidgetService
+"""
+import asyncio
+import pytest
+from datetime import datetime
+from types import MappingProxyType
+from unittest.mock import AsyncMock, MagicMock
+from bson import ObjectId
+
+from app.core.exceptions import BadRequestException, DatabaseException, NotFoundException
+from app.schemas.widget import WidgetCreate, WidgetUpdate
+from app.services.widget_service import WidgetService
+
+_FROZEN_TS = datetime(2024, 1, 1)
+_WIDGET_OID = ObjectId("507f1f77bcf86cd799439011")
+_DASHBOARD_OID = ObjectId("507f191e810c19729de860ea")
+_WIDGET_ID = str(_WIDGET_OID)
+_DASHBOARD_ID = str(_DASHBOARD_OID)
+# Read-only so that a test or service writing to a shared document fails loudly
+_WIDGET_DOC = MappingProxyType({
+    "_id": _WIDGET_OID,
+    "dashboard_id": _DASHBOARD_ID,
+    "metric_type": "BPM",
+    "created_at": _FROZEN_TS,
+    "updated_at": None
+})
+_DASHBOARD_DOC = MappingProxyType({
+    "_id": _DASHBOARD_OID,
+    "owner_id": "user123",
+    "beat_id": "beat123",
+    "name": "Test Dashboard",
+    "created_at": _FROZEN_TS,
+    "updated_at": None
+})
+
+
+class _CursorStub:
+    """Stand-in for a Motor cursor that records skip/limit and returns docs or raises exc"""
+
+    __slots__ = ("_docs", "_exc", "skipped", "limited", "length")
+
+    def __init__(self, docs=None, exc=None):
+        self._docs = docs
+        self._exc = exc
+        self.skipped = self.limited = self.length = None
+
+    def skip(self, skip):
+        self.skipped = skip
+        return self
+
+    def limit(self, limit):
+        self.limited = limit
+        return self
+
+    async def to_list(self, length):
+        self.length = length
+        if self._exc:
+            raise self._exc
+        return self._docs
+
+
+@pytest.fixture(autouse=True)
+def _no_sleep(monkeypatch):
+    """Keep a retry or backoff added to the service from sleeping for real in these unit tests"""
+    async def _sleep(delay, result=None):
+        return result
+
+    monkeypatch.setattr(asyncio, "sleep", _sleep)
+
+
+@pytest.fixture(autouse=True)
+def _clear_access_cache():
+    """Start every test without dashboard access decisions cached by an earlier one"""
+    WidgetService.clear_access_cache()
+    yield
+    WidgetService.clear_access_cache()
+
+
+@pytest.fixture
+def mock_db():
+    """Mock MongoDB database with widgets and dashboards collections"""
+    db = MagicMock()
+    db.widgets = MagicMock()
+    db.dashboards = MagicMock()
+    return db
+
+
+@pytest.fixture
+def widget_service(mock_db):
+    """WidgetService bound to the mock database"""
+    return WidgetService(mock_db)
+
+
+# The documents and payloads are shared by the whole session. serialize_widget pops _id, so tests
+# pass dict(sample_widget_doc) wherever the service serializes the document it reads
+@pytest.fixture(scope="session")
+def sample_widget_doc():
+    """Widget document as stored in MongoDB"""
+    return _WIDGET_DOC
+
+
+@pytest.fixture(scope="session")
+def mock_dashboard_doc():
+    """Dashboard document owned by user123"""
+    return _DASHBOARD_DOC
+
+
+@pytest.fixture(scope="session")
+def widget_create_data():
+    """Widget creation payload for the sample dashboard"""
+    return WidgetCreate(dashboardId=_DASHBOARD_ID, metricType="BPM")
+
+
+@pytest.fixture(scope="session")
+def widget_update_data():
+    """Widget update payload"""
+    return WidgetUpdate(metricType="ENERGY")
+
+
+class TestGetAll:
+    """Tests for WidgetService.get_all"""
+
+    async def test_get_all_success(self, widget_service, mock_db, sample_widget_doc):
+        """Test listing widgets"""
+        mock_db.widgets.find.return_value = _CursorStub([dict(sample_widget_doc)])
+
+        result = await widget_service.get_all()
+
+        assert len(result) == 1
+        assert result[0]["id"] == str(sample_widget_doc["_id"])
+        mock_db.widgets.find.assert_called_once_with({})
+
+    async def test_get_all_with_dashboard_filter(self, widget_service, mock_db, sample_widget_doc):
+        """Test listing widgets of one dashboard"""
+        mock_db.widgets.find.return_value = _CursorStub([dict(sample_widget_doc)])
+
+        await widget_service.get_all(dashboard_id=_DASHBOARD_ID)
+
+        mock_db.widgets.find.assert_called_once_with({"dashboard_id": _DASHBOARD_ID})
+
+    async def test_get_all_empty(self, widget_service, mock_db):
+        """Test listing widgets when there are none"""
+        mock_db.widgets.find.return_value = _CursorStub([])
+
+        assert await widget_service.get_all() == []
+
+    async def test_get_all_with_pagination(self, widget_service, mock_db):
+        """Test skip and limit are forwarded to the cursor"""
+        mock_cursor = _CursorStub([])
+        mock_db.widgets.find.return_value = mock_cursor
+
+        await widget_service.get_all(skip=10, limit=5)
+
+        assert (mock_cursor.skipped, mock_cursor.limited, mock_cursor.length) == (10, 5, 5)
+
+    async def test_get_all_database_error(self, widget_service, mock_db):
+        """Test driver errors are wrapped in DatabaseException"""
+        mock_db.widgets.find.return_value = _CursorStub(exc=Exception("Connection lost"))
+
+        with pytest.raises(DatabaseException) as exc_info:
+            await widget_service.get_all()
+        assert "Failed to retrieve widgets" in exc_info.value.detail
+
+
+class TestGetById:
+    """Tests for WidgetService.get_by_id"""
+
+    async def test_get_by_id_success(self, widget_service, mock_db, sample_widget_doc):
+        """Test retrieving a widget by id"""
+        mock_db.widgets.find_one = AsyncMock(return_value=dict(sample_widget_doc))
+
+        result = await widget_service.get_by_id(_WIDGET_ID)
+
+        assert result["id"] == _WIDGET_ID
+        assert result["metric_type"] == "BPM"
+
+    async def test_get_by_id_not_found(self, widget_service, mock_db):
+        """Test a missing widget raises NotFoundException"""
+        mock_db.widgets.find_one = AsyncMock(return_value=None)
+
+        with pytest.raises(NotFoundException):
+            await widget_service.get_by_id(_WIDGET_ID)
+
+    async def test_get_by_id_invalid_id(self, widget_service, mock_db):
+        """Test a malformed id is rejected before querying"""
+        mock_db.widgets.find_one = AsyncMock()
+
+        with pytest.raises(BadRequestException):
+            await widget_service.get_by_id("invalid_id")
+        mock_db.widgets.find_one.assert_not_called()
+
+    async def test_get_by_id_database_error(self, widget_service, mock_db):
+        """Test driver errors are wrapped in DatabaseException"""
+        mock_db.widgets.find_one = AsyncMock(side_effect=Exception("Connection lost"))
+
+        with pytest.raises(DatabaseException) as exc_info:
+            await widget_service.get_by_id(_WIDGET_ID)
+        assert "Failed to retrieve widget" in exc_info.value.detail
+
+
+class TestVerifyDashboardOwnership:
+    """Tests for WidgetService.verify_dashboard_ownership"""
+
+    async def test_verify_dashboard_ownership_owner(self, widget_service, mock_db, mock_dashboard_doc):
+        """Test the owner gets the dashboard back"""
+        mock_db.dashboards.find_one = AsyncMock(return_value=mock_dashboard_doc)
+
+        result = await widget_service.verify_dashboard_ownership(_DASHBOARD_ID, "user123")
+
+        assert result == mock_dashboard_doc
+
+    async def test_verify_dashboard_ownership_not_cached(self, widget_service, mock_db, mock_dashboard_doc):
+        """Test the dashboard document is always read fresh, even after access was cached"""
+        renamed = {**mock_dashboard_doc, "name": "Renamed"}
+        mock_db.dashboards.find_one = AsyncMock(side_effect=[mock_dashboard_doc, renamed])
+        mock_db.widgets.find.return_value = _CursorStub([])
+        await widget_service.get_by_dashboard(_DASHBOARD_ID, "user123")
+
+        result = await widget_service.verify_dashboard_ownership(_DASHBOARD_ID, "user123")
+
+        assert result["name"] == "Renamed"
+
+    @pytest.mark.parametrize("call, write", [
+        pytest.param(
+            lambda service: service.verify_dashboard_ownership(_DASHBOARD_ID, "other_user"),
+            "find", id="verify"
+        ),
+        pytest.param(
+            lambda service: service.create(
+                WidgetCreate(dashboardId=_DASHBOARD_ID, metricType="BPM"), user_id="other_user"
+            ),
+            "insert_one", id="create"
+        ),
+        pytest.param(
+            lambda service: service.update(
+                _WIDGET_ID, WidgetUpdate(metricType="ENERGY"), user_id="other_user"
+            ),
+            "update_one", id="update"
+        ),
+        pytest.param(
+            lambda service: service.delete(_WIDGET_ID, user_id="other_user"),
+            "delete_one", id="delete"
+        ),
+        pytest.param(
+            lambda service: service.get_by_dashboard(_DASHBOARD_ID, "other_user"),
+            "find", id="get_by_dashboard"
+        ),
+    ])
+    async def test_not_owner_is_denied(
+        self, widget_service, mock_db, sample_widget_doc, mock_dashboard_doc, call, write
+    ):
+        """Test every widget operation denies a user who doesn't own the dashboard"""
+        mock_db.widgets.find_one = AsyncMock(return_value=sample_widget_doc)
+        mock_db.dashboards.find_one = AsyncMock(return_value=mock_dashboard_doc)
+
+        with pytest.raises(BadRequestException) as exc_info:
+            await call(widget_service)
+        assert exc_info.value.code == "DASHBOARD_ACCESS_DENIED"
+        getattr(mock_db.widgets, write).assert_not_called()
+
+    async def test_verify_dashboard_ownership_admin(self, widget_service, mock_db, mock_dashboard_doc):
+        """Test an admin can access any dashboard"""
+        mock_db.dashboards.find_one = AsyncMock(return_value=mock_dashboard_doc)
+
+        result = await widget_service.verify_dashboard_ownership(_DASHBOARD_ID, "admin123", is_admin=True)
+
+        assert result == mock_dashboard_doc
+
+    async def test_verify_dashboard_ownership_not_found(self, widget_service, mock_db):
+        """Test a missing dashboard raises NotFoundException"""
+        mock_db.dashboards.find_one = AsyncMock(return_value=None)
+
+        with pytest.raises(NotFoundException) as exc_info:
+            await widget_service.verify_dashboard_ownership(_DASHBOARD_ID, "user123")
+        assert "Dashboard" in exc_info.value.detail
+
+    async def test_verify_dashboard_ownership_invalid_id(self, widget_service, mock_db):
+        """Test a malformed dashboard id is rejected"""
+        with pytest.raises(BadRequestException) as exc_info:
+            await widget_service.verify_dashboard_ownership("invalid_id", "user123")
+        assert "Invalid dashboard ID format" in exc_info.value.detail
+
+
+class TestCreate:
+    """Tests for WidgetService.create"""
+
+    async def test_create_success(
+        self, widget_service, mock_db, sample_widget_doc, mock_dashboard_doc, widget_create_data
+    ):
+        """Test creating a widget on an owned dashboard"""
+        mock_db.dashboards.find_one = AsyncMock(return_value=mock_dashboard_doc)
+        mock_db.widgets.insert_one = AsyncMock(return_value=MagicMock(inserted_id=sample_widget_doc["_id"]))
+        mock_db.widgets.find_one = AsyncMock(return_value=dict(sample_widget_doc))
+
+        result = await widget_service.create(widget_create_data, user_id="user123")
+
+        assert result["id"] == str(sample_widget_doc["_id"])
+        inserted = mock_db.widgets.insert_one.call_args[0][0]
+        assert inserted["dashboard_id"] == _DASHBOARD_ID
+        assert inserted["metric_type"] == "BPM"
+        assert inserted["updated_at"] is None
+
+    async def test_create_dashboard_not_found(self, widget_service, mock_db, widget_create_data):
+        """Test creating a widget on a missing dashboard"""
+        mock_db.dashboards.find_one = AsyncMock(return_value=None)
+
+        with pytest.raises(NotFoundException):
+            await widget_service.create(widget_create_data, user_id="user123")
+
+    async def test_create_database_error(
+        self, widget_service, mock_db, mock_dashboard_doc, widget_create_data
+    ):
+        """Test insert failures are wrapped in DatabaseException"""
+        mock_db.dashboards.find_one = AsyncMock(return_value=mock_dashboard_doc)
+        mock_db.widgets.insert_one = AsyncMock(side_effect=Exception("Insert failed"))
+
+        with pytest.raises(DatabaseException) as exc_info:
+            await widget_service.create(widget_create_data, user_id="user123")
+        assert "Failed to create widget" in exc_info.value.detail
+
+
+class TestUpdate:
+    """Tests for WidgetService.update"""
+
+    async def test_update_success(
+        self, widget_service, mock_db, sample_widget_doc, mock_dashboard_doc, widget_update_data
+    ):
+        """Test updating a widget on an owned dashboard"""
+        updated_doc = {**sample_widget_doc, "metric_type": "ENERGY", "updated_at": datetime(2024, 1, 2)}
+        mock_db.widgets.find_one = AsyncMock(side_effect=[sample_widget_doc, updated_doc])
+        mock_db.dashboards.find_one = AsyncMock(return_value=mock_dashboard_doc)
+        mock_db.widgets.update_one = AsyncMock()
+
+        result = await widget_service.update(_WIDGET_ID, widget_update_data, user_id="user123")
+
+        assert result["metric_type"] == "ENERGY"
+        update = mock_db.widgets.update_one.call_args[0][1]["$set"]
+        assert update["metric_type"] == "ENERGY"
+        assert "updated_at" in update
+
+    async def test_update_not_found(self, widget_service, mock_db, widget_update_data):
+        """Test updating a missing widget"""
+        mock_db.widgets.find_one = AsyncMock(return_value=None)
+
+        with pytest.raises(NotFoundException):
+            await widget_service.update(_WIDGET_ID, widget_update_data, user_id="user123")
+
+    async def test_update_admin_can_update_any(
+        self, widget_service, mock_db, sample_widget_doc, mock_dashboard_doc, widget_update_data
+    ):
+        """Test an admin can update widgets on any dashboard"""
+        updated_doc = {**sample_widget_doc, "metric_type": "ENERGY", "updated_at": datetime(2024, 1, 2)}
+        mock_db.widgets.find_one = AsyncMock(side_effect=[sample_widget_doc, updated_doc])
+        mock_db.dashboards.find_one = AsyncMock(return_value=mock_dashboard_doc)
+        mock_db.widgets.update_one = AsyncMock()
+
+        result = await widget_service.update(
+            _WIDGET_ID, widget_update_data, user_id="admin123", is_admin=True
+        )
+
+        assert result["metric_type"] == "ENERGY"
+
+    async def test_update_no_changes(self, widget_service, mock_db, sample_widget_doc, mock_dashboard_doc):
+        """Test an empty update returns the widget without writing"""
+        mock_db.widgets.find_one = AsyncMock(return_value=dict(sample_widget_doc))
+        mock_db.dashboards.find_one = AsyncMock(return_value=mock_dashboard_doc)
+        mock_db.widgets.update_one = AsyncMock()
+
+        result = await widget_service.update(_WIDGET_ID, WidgetUpdate(), user_id="user123")
+
+        assert result["id"] == _WIDGET_ID
+        mock_db.widgets.update_one.assert_not_called()
+
+
+class TestDelete:
+    """Tests for WidgetService.delete"""
+
+    async def test_delete_success(self, widget_service, mock_db, sample_widget_doc, mock_dashboard_doc):
+        """Test deleting a widget on an owned dashboard"""
+        mock_db.widgets.find_one = AsyncMock(return_value=sample_widget_doc)
+        mock_db.dashboards.find_one = AsyncMock(return_value=mock_dashboard_doc)
+        mock_db.widgets.delete_one = AsyncMock()
+
+        result = await widget_service.delete(_WIDGET_ID, user_id="user123")
+
+        assert result == {"message": "Widget deleted successfully", "id": _WIDGET_ID}
+        mock_db.widgets.delete_one.assert_awaited_once_with({"_id": _WIDGET_OID})
+
+    async def test_delete_not_found(self, widget_service, mock_db):
+        """Test deleting a missing widget"""
+        mock_db.widgets.find_one = AsyncMock(return_value=None)
+
+        with pytest.raises(NotFoundException):
+            await widget_service.delete(_WIDGET_ID, user_id="user123")
+
+    async def test_delete_admin_can_delete_any(
+        self, widget_service, mock_db, sample_widget_doc, mock_dashboard_doc
+    ):
+        """Test an admin can delete widgets on any dashboard"""
+        mock_db.widgets.find_one = AsyncMock(return_value=sample_widget_doc)
+        mock_db.dashboards.find_one = AsyncMock(return_value=mock_dashboard_doc)
+        mock_db.widgets.delete_one = AsyncMock()
+
+        result = await widget_service.delete(_WIDGET_ID, user_id="admin123", is_admin=True)
+
+        assert result["id"] == _WIDGET_ID
+        mock_db.widgets.delete_one.assert_awaited_once()
+
+
+class TestGetByDashboard:
+    """Tests for WidgetService.get_by_dashboard"""
+
+    # Denied access is covered by TestVerifyDashboardOwnership.test_not_owner_is_denied
+    @pytest.mark.parametrize("user_id, is_admin", [
+        pytest.param("user123", False, id="owner"),
+        pytest.param("admin123", True, id="admin"),
+    ])
+    async def test_get_by_dashboard_access(
+        self, widget_service, mock_db, sample_widget_doc, mock_dashboard_doc, user_id, is_admin
+    ):
+        """Test the owner and an admin can list the widgets of a dashboard"""
+        mock_db.dashboards.find_one = AsyncMock(return_value=mock_dashboard_doc)
+        mock_db.widgets.find.return_value = _CursorStub([dict(sample_widget_doc)])
+
+        result = await widget_service.get_by_dashboard(_DASHBOARD_ID, user_id, is_admin=is_admin)
+
+        assert len(result) == 1
+        assert result[0]["id"] == _WIDGET_ID
+        mock_db.dashboards.find_one.assert_called_once_with({"_id": _DASHBOARD_OID})
+        mock_db.widgets.find.assert_called_once_with({"dashboard_id": _DASHBOARD_ID})
+
+    async def test_get_by_dashboard_reuses_access(
+        self, widget_service, mock_db, sample_widget_doc, mock_dashboard_doc
+    ):
+        """Test a second listing reuses the cached access decision"""
+        mock_db.dashboards.find_one = AsyncMock(return_value=mock_dashboard_doc)
+        for _ in range(2):
+            mock_db.widgets.find.return_value = _CursorStub([dict(sample_widget_doc)])
+            await widget_service.get_by_dashboard(_DASHBOARD_ID, "user123")
+
+        mock_db.dashboards.find_one.assert_called_once()
+
+    async def test_access_cached_by_listing_is_reused_by_create(
+        self, widget_service, mock_db, sample_widget_doc, mock_dashboard_doc, widget_create_data
+    ):
+        """Test creating a widget right after listing the dashboard skips the dashboard lookup"""
+        mock_db.dashboards.find_one = AsyncMock(return_value=mock_dashboard_doc)
+        mock_db.widgets.find.return_value = _CursorStub([dict(sample_widget_doc)])
+        mock_db.widgets.insert_one = AsyncMock(return_value=MagicMock(inserted_id=_WIDGET_OID))
+        mock_db.widgets.find_one = AsyncMock(return_value=dict(sample_widget_doc))
+
+        await widget_service.get_by_dashboard(_DASHBOARD_ID, "user123")
+        await widget_service.create(widget_create_data, user_id="user123")
+
+        mock_db.dashboards.find_one.assert_called_once()
+        mock_db.widgets.insert_one.assert_awaited_once()
+
+    # ObjectId hex is case-insensitive, so either spelling must drop the cached decision
+    @pytest.mark.parametrize("invalidated_id", [_DASHBOARD_ID, _DASHBOARD_ID.upper()], ids=["lower", "upper"])
+    async def test_get_by_dashboard_after_access_invalidated(
+        self, widget_service, mock_db, sample_widget_doc, mock_dashboard_doc, invalidated_id
+    ):
+        """Test invalidating a dashboard's access makes the next listing look it up again"""
+        mock_db.dashboards.find_one = AsyncMock(return_value=mock_dashboard_doc)
+        mock_db.widgets.find.return_value = _CursorStub([dict(sample_widget_doc)])
+        await widget_service.get_by_dashboard(_DASHBOARD_ID, "user123")
+
+        WidgetService.invalidate_dashboard_access(invalidated_id)
+        mock_db.widgets.find.return_value = _CursorStub([dict(sample_widget_doc)])
+        await widget_service.get_by_dashboard(_DASHBOARD_ID, "user123")
+
+        assert mock_db.dashboards.find_one.await_count == 2
@@ -0,0 +1,49 @@
+"""
+Tests for WidgetService's synchronous helpers
+"""
+import pytest
+from bson import ObjectId
+
+from app.core.exceptions import BadRequestException
+from app.services.widget_service import WidgetService
+
+_WIDGET_OID = ObjectId("507f1f77bcf86cd799439011")
+
+
+class TestValidateObjectId:
+    """Tests for WidgetService.validate_object_id"""
+
+    def test_validate_object_id_valid(self):
+        """Test a well-formed id is converted to ObjectId"""
+        result = WidgetService.validate_object_id("507f1f77bcf86cd799439011")
+        assert result == _WIDGET_OID
+
+    def test_validate_object_id_reuses_parsed_id(self):
+        """Test a repeated id is served from the parse cache"""
+        first = WidgetService.validate_object_id("507f1f77bcf86cd799439011")
+        assert WidgetService.validate_object_id("507f1f77bcf86cd799439011") is first
+
+    @pytest.mark.parametrize("widget_id", ["invalid_id_123", ""], ids=["malformed", "empty"])
+    def test_validate_object_id_invalid(self, widget_id):
+        """Test malformed and empty ids are rejected"""
+        with pytest.raises(BadRequestException) as exc_info:
+            WidgetService.validate_object_id(widget_id)
+        assert "Invalid widget ID format" in exc_info.value.detail
+
+
+class TestSerializeWidget:
+    """Tests for WidgetService.serialize_widget"""
+
+    @pytest.mark.parametrize("widget, expected", [
+        pytest.param(
+            {"_id": _WIDGET_OID, "metric_type": "BPM"},
+            {"id": "507f1f77bcf86cd799439011", "metric_type": "BPM"},
+            id="with_id"
+        ),
+        pytest.param({"metric_type": "BPM"}, {"metric_type": "BPM"}, id="without_id"),
+        pytest.param(None, None, id="none"),
+        pytest.param({}, {}, id="empty"),
+    ])
+    def test_serialize_widget(self, widget, expected):
+        """Test _id is replaced by its string form under id and anything else passes through"""
+        assert WidgetService.serialize_widget(widget) == expected